@@ -0,0 +1,13 @@
+"""Сборка опционального Cython-ядра ассемблера.
+
+Запуск: python setup.py build_ext --inplace
+Без собранного расширения ассемблер работает на чистом Python.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='uvm-assembler',
+    ext_modules=cythonize('uvm_assembler_core.pyx', language_level=3),
+)
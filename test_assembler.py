@@ -1,15 +1,16 @@
 import subprocess
 import sys
 import os
+import textwrap
 from pathlib import Path
 
 
 def run_command(cmd, description=""):
-    """Выполняет команду и выводит результат."""
+    """Выполняет команду (список аргументов) и выводит результат."""
     if description:
         print(description)
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, encoding='utf-8')
+        result = subprocess.run(cmd, shell=False, capture_output=True, text=True, encoding='utf-8')
         if result.stdout:
             print(result.stdout)
         if result.stderr and result.returncode != 0:
@@ -35,7 +36,7 @@ def main():
 
     # 1. Проверка наличия Python
     print("1. Проверка окружения...")
-    result = run_command("python --version", "   python:")
+    result = run_command([sys.executable, '--version'], "   python:")
     if not result:
         print("✗ Python3 не установлен")
         sys.exit(1)
@@ -45,7 +46,8 @@ def main():
     print("2. Тестирование на примерах спецификации...")
     print("   Команда: python uvm_assembler.py tests.asm tests.bin --test\n")
 
-    cmd = "python uvm_assembler.py ./files/tests.txt ./files/output.bin --test"
+    cmd = [sys.executable, 'uvm_assembler.py',
+           './files/tests.txt', './files/output.bin', '--test']
     success = run_command(cmd)
 
     if not success:
@@ -67,10 +69,10 @@ def main():
 
         with open('./files/output.bin', 'rb') as f:
             data = f.read()
-            hex_str = ' '.join(f'{b:02X}' for b in data)
+            hex_str = data.hex(' ').upper()
             # Разбиваем на строки по 16 байт (4 инструкции)
-            for i in range(0, len(hex_str), 47):  # 47 символов = 4 байта * "XX " + пробелы
-                print(f"    {hex_str[i:i + 47]}")
+            for chunk_line in textwrap.wrap(hex_str, 47):
+                print(f"    {chunk_line}")
 
         print()
     else:
@@ -105,7 +107,7 @@ def main():
         offset = i * 4
         chunk = data[offset:offset + 4]
         opcode = chunk[0]
-        operand = chunk[1] | (chunk[2] << 8) | (chunk[3] << 16)
+        operand = int.from_bytes(chunk[1:4], 'little')
         hex_str = ', '.join(f'0x{b:02X}' for b in chunk)
 
         print(f"Инструкция {i + 1}:")
@@ -1,7 +1,46 @@
+import re
 import sys
 import struct
+from array import array
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+try:
+    # Cython-ядро, собирается командой: python setup.py build_ext --inplace
+    import uvm_assembler_core as _core
+except ImportError:
+    _core = None
+
+try:
+    from numba import njit as _njit, prange as _prange
+except ImportError:
+    _njit = None
+
+# Порог, с которого JIT-ядро окупает стоимость прогрева
+_NUMBA_MIN_INSTRUCTIONS = 4096
+
+if _np is not None and _njit is not None:
+    @_njit(cache=True, parallel=True)
+    def _pack_words(opcodes, operands, out):
+        for i in _prange(opcodes.shape[0]):
+            out[i] = ((operands[i] & 0x7FFFFF) << 8) | opcodes[i]
+else:
+    _pack_words = None
+
+# Формат одной инструкции: опкод + 3 байта операнда (little-endian)
+_PACKER = struct.Struct('<BBBB')
+
+# Строка вида "МНЕМОНИКА операнд[,]" — разбор всего файла одним проходом
+# регулярного выражения вместо strip()/split() по каждой строке
+_LINE_RE = re.compile(
+    r"^[ \t]*([A-Za-z_]+)[ \t]+(0[xX][0-9A-Fa-f]+|\d+),?[ \t\r]*$",
+    re.MULTILINE)
+_NONBLANK_RE = re.compile(r"^[ \t]*\S", re.MULTILINE)
 
 
 class Instruction:
@@ -16,14 +55,10 @@ class Instruction:
         self.operand = operand
 
     def encode(self) -> bytes:
-        # Байт 0: опкод
-        byte0 = self.opcode & 0xFF
-        # Байты 1-3: операнд в little-endian
-        byte1 = (self.operand >> 0) & 0xFF
-        byte2 = (self.operand >> 8) & 0xFF
-        byte3 = (self.operand >> 16) & 0xFF
-
-        return bytes([byte0, byte1, byte2, byte3])
+        # Байт 0: опкод; байты 1-3: операнд одним вызовом to_bytes
+        # вместо трёх сдвигов с масками
+        return bytes((self.opcode & 0xFF,)) + \
+            self.operand.to_bytes(3, 'little')
 
     def __repr__(self) -> str:
         """Строковое представление для отладки."""
@@ -35,122 +70,271 @@ class AssemblyException(Exception):
 
 
 class UVMAssembler:
+    # Ключи интернированы: поиск интернированного токена в словаре
+    # сравнивает указатели вместо повторного хеширования строки
     MNEMONICS = {
-        'LOAD': Instruction.OPCODE_LOAD,
-        'READ': Instruction.OPCODE_READ,
-        'WRITE': Instruction.OPCODE_WRITE,
-        'XOR': Instruction.OPCODE_XOR,
+        sys.intern('LOAD'): Instruction.OPCODE_LOAD,
+        sys.intern('READ'): Instruction.OPCODE_READ,
+        sys.intern('WRITE'): Instruction.OPCODE_WRITE,
+        sys.intern('XOR'): Instruction.OPCODE_XOR,
+        # Дубликаты в нижнем регистре: частый путь обходится без .upper()
+        sys.intern('load'): Instruction.OPCODE_LOAD,
+        sys.intern('read'): Instruction.OPCODE_READ,
+        sys.intern('write'): Instruction.OPCODE_WRITE,
+        sys.intern('xor'): Instruction.OPCODE_XOR,
     }
 
     def __init__(self, test_mode: bool = False):
         self.test_mode = test_mode
-        self.instructions: List[Instruction] = []
-
-    def assemble(self, input_file: str, output_file: str) -> None:
+        # Инструкции хранятся как параллельные массивы (SoA),
+        # без создания Python-объекта на каждую строку
+        self.opcodes = array('B')
+        self.operands = array('I')
+        # Полный образ машинного кода; в потоковом режиме не строится
+        self.binary_data: Optional[bytes] = None
+        # Машинный код, собранный Cython-ядром (если оно доступно)
+        self._core_binary: Optional[bytes] = None
+        # Кэш разобранных операндов: повторяющиеся литералы
+        # (адреса, константы) парсятся один раз
+        self._operand_cache: Dict[str, int] = {}
+
+    def assemble(self, input_file: str, output_file: str,
+                 stream: bool = False) -> None:
         # Этап 1 Чтение исходного файла
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            text = Path(input_file).read_text(encoding='utf-8')
         except FileNotFoundError:
             raise FileNotFoundError(f"Файл не найден: {input_file}")
 
         # Этап 2 Трансляция в промежуточный код
-        self._parse_assembly(lines)
+        self._parse_assembly_text(text)
 
         # Этап 3 Трансляция в машиннный код
-        self._generate_machine_code()
+        # (в потоковом режиме код пишется чанками, без полного буфера)
+        if not stream:
+            self._generate_machine_code()
 
         # Этап 4 Вывод внутреннего представления (если режим тестирования)
         if self.test_mode:
             self._print_internal_representation()
 
         # Этап 5 Генерация бинарного файла
-        self._write_binary_file(output_file)
+        if stream:
+            with open(output_file, 'wb') as f:
+                self._write_binary_streaming(f)
+        else:
+            self._write_binary_file(output_file)
 
         # Этап 6 Вывод о данных файла
         self._print_summary(output_file)
 
-    def _parse_assembly(self, lines: List[str]) -> None:
-        for line_num, line in enumerate(lines, start=1):
-            line = line.strip()
+    def _parse_assembly_text(self, text: str) -> None:
+        # Быстрый путь: если регулярное выражение покрыло все непустые
+        # строки, разбор идёт по готовым парам (мнемоника, операнд)
+        matches = _LINE_RE.findall(text)
+        if len(matches) == len(_NONBLANK_RE.findall(text)):
+            if _core is not None:
+                try:
+                    ops_b, opers_b, binary = _core.assemble_pairs(matches)
+                except ValueError:
+                    # Построчный разбор ниже даст сообщение "Line N"
+                    pass
+                else:
+                    self.opcodes.frombytes(ops_b)
+                    self.operands.frombytes(opers_b)
+                    self._core_binary = binary
+                    return
 
-            if not line:
-                continue
+            try:
+                self._parse_matches(matches)
+                return
+            except (AssemblyException, ValueError):
+                # Перезапускаем построчный разбор ради сообщения "Line N".
+                # ValueError возможен даже для токена, прошедшего \d+:
+                # int() на Python >= 3.11 ограничивает длину десятичной
+                # строки (4300 цифр)
+                del self.opcodes[:]
+                del self.operands[:]
+
+        self._parse_assembly(text.splitlines())
+
+    def _parse_matches(self, matches: List[Tuple[str, str]]) -> None:
+        mnem_map = self.MNEMONICS
+        opcode_of = _opcode_of
+        opcodes = self.opcodes
+        operands = self.operands
+        cache_get = self._operand_cache.get
+
+        for mnemonic, operand_str in matches:
+            opcode = opcode_of(mnemonic)
+            if opcode is None:
+                # Смешанный регистр или неизвестная команда
+                opcode = mnem_map.get(mnemonic.upper())
+                if opcode is None:
+                    raise AssemblyException(
+                        f"Неизвестная команда: {mnemonic.upper()}")
+
+            operand = cache_get(operand_str)
+            if operand is None:
+                operand = self._parse_operand(operand_str)
+            if operand & ~0x7FFFFF:
+                raise AssemblyException(f"Операнд вне диапазона: {operand}")
+
+            opcodes.append(opcode)
+            operands.append(operand)
 
+    def _parse_assembly(self, lines: List[str]) -> None:
+        for line_num, line in enumerate(lines, start=1):
+            # str.split() без аргументов сам отбрасывает пробелы по краям,
+            # отдельный strip() не нужен
             tokens = line.split()
             if not tokens:
                 continue
 
-            mnemonic = tokens[0].upper()
+            mnemonic = sys.intern(tokens[0])
 
             try:
-                instr = self._parse_instruction(mnemonic, tokens, line_num)
-                self.instructions.append(instr)
+                opcode, operand = self._parse_instruction(mnemonic, tokens,
+                                                          line_num)
+                self.opcodes.append(opcode)
+                self.operands.append(operand)
             except AssemblyException as e:
                 raise AssemblyException(f"Line {line_num}: {str(e)}")
 
     def _generate_machine_code(self) -> None:
-        binary_parts: List[bytes] = []
-
-        for instr in self.instructions:
-            encoded = instr.encode()
-            binary_parts.append(encoded)
-
-        self.binary_data = b''.join(binary_parts)
+        if self._core_binary is not None:
+            self.binary_data = self._core_binary
+            return
+
+        if _np is not None:
+            ops = _np.frombuffer(self.opcodes, dtype=_np.uint8)
+            opers = _np.frombuffer(self.operands, dtype='=u4')
+
+            if (_pack_words is not None
+                    and len(ops) > _NUMBA_MIN_INSTRUCTIONS):
+                words = _np.empty(len(ops), dtype=_np.uint32)
+                _pack_words(ops, opers, words)
+            else:
+                # Слово инструкции: опкод в младшем байте,
+                # операнд в битах 8-30
+                words = ops.astype(_np.uint32) | ((opers & 0x7FFFFF) << 8)
+
+            self.binary_data = words.astype('<u4', copy=False).tobytes()
+            return
+
+        buf = bytearray(4 * len(self.opcodes))
+        pack_into = _PACKER.pack_into
+
+        for i, (opcode, operand) in enumerate(zip(self.opcodes,
+                                                  self.operands)):
+            pack_into(buf, i * 4,
+                      opcode,
+                      operand & 0xFF,
+                      (operand >> 8) & 0xFF,
+                      (operand >> 16) & 0xFF)
+
+        self.binary_data = bytes(buf)
 
     def _parse_instruction(self, mnemonic: str, tokens: List[str],
-                           line_num: int) -> Instruction:
+                           line_num: int) -> Tuple[int, int]:
         if len(tokens) < 2:
-            raise AssemblyException(f"Команда '{mnemonic}' требует операнда")
+            raise AssemblyException(
+                f"Команда '{mnemonic.upper()}' требует операнда")
 
         try:
             operand = self._parse_operand(tokens[1])
         except ValueError as e:
             raise AssemblyException(f"Неверный формат операнда: {tokens[1]}")
 
-        if not (0 <= operand <= 0x7FFFFF):
+        # Маска вместо двойного сравнения: ненулевой результат означает
+        # выход за 23 бита либо отрицательное значение
+        if operand & ~0x7FFFFF:
             raise AssemblyException(f"Операнд вне диапазона: {operand}")
 
-        if mnemonic not in self.MNEMONICS:
-            raise AssemblyException(f"Неизвестная команда: {mnemonic}")
+        opcode = self.MNEMONICS.get(mnemonic)
+        if opcode is None:
+            # Смешанный регистр ('Load') — редкий путь через .upper()
+            opcode = self.MNEMONICS.get(mnemonic.upper())
+            if opcode is None:
+                raise AssemblyException(
+                    f"Неизвестная команда: {mnemonic.upper()}")
 
-        opcode = self.MNEMONICS[mnemonic]
-        return Instruction(opcode, operand)
+        return opcode, operand
 
     def _parse_operand(self, operand_str: str) -> int:
-        operand_str = operand_str.strip()
+        cached = self._operand_cache.get(operand_str)
+        if cached is not None:
+            return cached
+
+        s = operand_str
 
         # Удаляем запятую если она есть (для совместимости)
-        if operand_str.endswith(','):
-            operand_str = operand_str[:-1]
+        if s.endswith(','):
+            s = s[:-1]
 
-        # Поддерживаем шестнадцатеричные числа (0x...)
-        if operand_str.lower().startswith('0x'):
-            return int(operand_str, 16)
+        # Поддерживаем шестнадцатеричные числа (0x...) без создания
+        # промежуточной копии в нижнем регистре
+        if len(s) > 1 and s[0] == '0' and s[1] in 'xX':
+            value = int(s, 16)
+        else:
+            # Десятичное число
+            value = int(s, 10)
 
-        # Десятичное число
-        return int(operand_str, 10)
+        self._operand_cache[operand_str] = value
+        return value
 
     def _print_internal_representation(self) -> None:
-        print("\n=== ВНУТРЕННЕЕ ПРЕДСТАВЛЕНИЕ ===\n")
+        # Вывод собирается целиком и пишется одним вызовом: один захват
+        # блокировки stdout вместо пяти print() на инструкцию
+        lines = ["", "=== ВНУТРЕННЕЕ ПРЕДСТАВЛЕНИЕ ===", ""]
+
+        pairs = zip(self.opcodes, self.operands)
+        for i, (opcode, operand) in enumerate(pairs, start=1):
+            encoded = Instruction(opcode, operand).encode()
 
-        for i, instr in enumerate(self.instructions, start=1):
-            encoded = instr.encode()
+            lines.append(f"Instruction {i}:")
+            lines.append(f"  Opcode (A): {opcode}")
+            lines.append(f"  Operand (B): {operand}")
+            lines.append(
+                f"  Binary: {', '.join(f'0x{b:02X}' for b in encoded)}")
+            lines.append("")
 
-            print(f"Instruction {i}:")
-            print(f"  Opcode (A): {instr.opcode}")
-            print(f"  Operand (B): {instr.operand}")
-            print(f"  Binary: {', '.join(f'0x{b:02X}' for b in encoded)}")
-            print()
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def _write_binary_file(self, output_file: str) -> None:
         with open(output_file, 'wb') as f:
-            for instr in self.instructions:
-                f.write(instr.encode())
+            f.write(self.binary_data)
+
+    def _write_binary_streaming(self, f, chunk_instrs: int = 16384) -> None:
+        """Пишет машинный код чанками по chunk_instrs инструкций.
+
+        Память остаётся константной независимо от размера программы:
+        один переиспользуемый буфер и один write() на чанк.
+        """
+        buf = bytearray(chunk_instrs * 4)
+        pack_into = _PACKER.pack_into
+        filled = 0
+
+        for opcode, operand in zip(self.opcodes, self.operands):
+            pack_into(buf, filled * 4,
+                      opcode,
+                      operand & 0xFF,
+                      (operand >> 8) & 0xFF,
+                      (operand >> 16) & 0xFF)
+            filled += 1
+            if filled == chunk_instrs:
+                f.write(buf)
+                filled = 0
+
+        if filled:
+            f.write(memoryview(buf)[:filled * 4])
 
     def _print_summary(self, output_file: str) -> None:
-        file_size = len(self.binary_data)
-        instruction_count = len(self.instructions)
+        if self.binary_data is not None:
+            file_size = len(self.binary_data)
+        else:
+            file_size = Path(output_file).stat().st_size
+        instruction_count = len(self.opcodes)
 
         print("\n" + "=" * 60)
         print("  СВОДКА ПО АССЕМБЛИРОВАНИЮ")
@@ -166,18 +350,42 @@ class UVMAssembler:
         print()
 
 
+def _make_opcode_lookup():
+    """Генерирует специализированный поиск опкода по таблице мнемоник.
+
+    Вместо словаря — цепочка сравнений с константами, встроенными в
+    байткод (частичное вычисление по фиксированному набору команд).
+    Возвращает None для написаний, которых нет в таблице.
+    """
+    lines = ['def _opcode_of(tok):']
+    for mnem, op in UVMAssembler.MNEMONICS.items():
+        lines.append(f'    if tok == {mnem!r}:')
+        lines.append(f'        return {op}')
+    lines.append('    return None')
+
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['_opcode_of']
+
+
+_opcode_of = _make_opcode_lookup()
+
+
 def main():
     if len(sys.argv) < 3:
         sys.exit(1)
 
     input_file = sys.argv[1]
     output_file = sys.argv[2]
-    test_mode = len(sys.argv) > 3 and sys.argv[3] == '--test'
+    flags = sys.argv[3:]
+    test_mode = '--test' in flags
+    stream = '--stream' in flags
 
     try:
         assembler = UVMAssembler(test_mode)
-        assembler.assemble(input_file, output_file)
-        print(assembler.binary_data)
+        assembler.assemble(input_file, output_file, stream=stream)
+        if assembler.binary_data is not None:
+            print(assembler.binary_data)
         print(f"✓ Успешно скомпилировано в {output_file}")
     except FileNotFoundError as e:
         print(f"ERROR: {e}", file=sys.stderr)
@@ -0,0 +1,61 @@
+# cython: language_level=3
+"""Горячий цикл ассемблера УВМ, скомпилированный Cython.
+
+Принимает пары (мнемоника, операнд), извлечённые регулярным выражением,
+и собирает машинный код без интерпретируемого цикла. Модуль опционален:
+uvm_assembler.py при его отсутствии использует чистый Python.
+"""
+
+from cpython.bytearray cimport PyByteArray_AS_STRING
+
+
+cdef unsigned char _opcode_of(str mnemonic) except 0:
+    # Только точные написания; смешанный регистр ('Load') обрабатывает
+    # запасной путь на Python через ValueError
+    if mnemonic == 'LOAD' or mnemonic == 'load':
+        return 102
+    if mnemonic == 'READ' or mnemonic == 'read':
+        return 155
+    if mnemonic == 'WRITE' or mnemonic == 'write':
+        return 49
+    if mnemonic == 'XOR' or mnemonic == 'xor':
+        return 136
+    raise ValueError('Неизвестная команда: %s' % mnemonic)
+
+
+def assemble_pairs(list pairs):
+    """Возвращает (опкоды, операнды-u4, машинный код) как bytes."""
+    cdef Py_ssize_t i, n = len(pairs)
+    cdef bytearray ops = bytearray(n)
+    cdef bytearray opers = bytearray(4 * n)
+    cdef bytearray binary = bytearray(4 * n)
+    cdef unsigned char* ops_p = <unsigned char*> PyByteArray_AS_STRING(ops)
+    cdef unsigned int* opers_p = <unsigned int*> PyByteArray_AS_STRING(opers)
+    cdef unsigned char* bin_p = <unsigned char*> PyByteArray_AS_STRING(binary)
+    cdef unsigned char opcode
+    cdef unsigned int operand
+    cdef object value
+    cdef str mnemonic, operand_str
+
+    for i in range(n):
+        mnemonic, operand_str = pairs[i]
+        opcode = _opcode_of(mnemonic)
+
+        if (len(operand_str) > 1 and operand_str[0] == '0'
+                and (operand_str[1] == 'x' or operand_str[1] == 'X')):
+            value = int(operand_str, 16)
+        else:
+            value = int(operand_str)
+
+        if value < 0 or value > 0x7FFFFF:
+            raise ValueError('Операнд вне диапазона: %s' % value)
+
+        operand = <unsigned int> value
+        ops_p[i] = opcode
+        opers_p[i] = operand
+        bin_p[4 * i] = opcode
+        bin_p[4 * i + 1] = operand & 0xFF
+        bin_p[4 * i + 2] = (operand >> 8) & 0xFF
+        bin_p[4 * i + 3] = (operand >> 16) & 0xFF
+
+    return bytes(ops), bytes(opers), bytes(binary)